@@ -1,9 +1,69 @@
+import os
+import pickle
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from tkinter import ttk
 from tkinter import messagebox
 import imp_items
 from stock_analysis import StockAnalysis
 
+# Directory listing cache so GUI startup does not re-walk the data
+# folder when nothing in it has changed.
+_PATHS_CACHE = os.path.join(imp_items.paths[0], 'csv_paths.pkl')
+
+def _cached_csv_files(data_dir):
+    """
+    Return the CSV files under data_dir, cached by directory mtime.
+
+    The listing is pickled alongside the directory's mtime; the walk is
+    only repeated when the directory has actually changed.
+
+    Args:
+        data_dir (str): The folder holding the per-company CSV files.
+
+    Returns:
+        list: Paths to the CSV files found.
+    """
+    try:
+        mtime = os.path.getmtime(data_dir)
+    except OSError:
+        return []
+    try:
+        with open(_PATHS_CACHE, 'rb') as f:
+            cached_mtime, paths = pickle.load(f)
+        if cached_mtime == mtime:
+            return paths
+    except (OSError, EOFError, pickle.PickleError, ValueError):
+        pass
+    paths = imp_items.find_csv_files(data_dir)
+    try:
+        with open(_PATHS_CACHE, 'wb') as f:
+            pickle.dump((mtime, paths), f)
+    except OSError as e:
+        print(f"Could not write path cache: {e}")
+    return paths
+
+@lru_cache(maxsize=64)
+def _analyze(path):
+    """
+    Run the analysis pipeline for one company CSV, memoized per path.
+
+    The analysis is deterministic in the file path, so the first click
+    pays the full pipeline cost and repeat clicks for the same company
+    reuse the finished analyzer.
+
+    Args:
+        path (str): Path to the company's CSV file.
+
+    Returns:
+        StockAnalysis: The analyzer with data and model ready.
+    """
+    analyzer = StockAnalysis([path])
+    analyzer.run_pipeline()
+    analyzer.evaluate_models()
+    return analyzer
+
 class StockAnalysisGUI:
     """
     StockAnalysisGUI: A class to create the GUI for the stock analysis tool.
@@ -33,35 +93,72 @@ class StockAnalysisGUI:
         self.analyze_button = ttk.Button(master, text="Analyze", command=self.analyze_company)
         self.analyze_button.grid(row=1, column=0, columnspan=2, padx=10, pady=5)
 
-        self.stock_data_paths = imp_items.find_csv_files("C:\\Users\\bunas\\ドキュメント\\stock_ai\\data\\company_wise_data")
-        print(self.stock_data_paths)
-        
+        self.stock_data_paths = _cached_csv_files(imp_items.paths[3])
+
+        # Lowercased company basenames prepared once, so each search is
+        # a substring test against ready keys instead of lowering every
+        # path on every click
+        self._lower_basenames = {
+            os.path.splitext(os.path.basename(path))[0].lower(): path
+            for path in self.stock_data_paths}
+
+        # Analysis runs on this pool so the Tk event loop keeps pumping
+        # while models train; results are marshalled back with after()
+        self._pool = ThreadPoolExecutor(max_workers=2)
+
     def analyze_company(self):
         company_name = self.search_entry.get().strip()
         if not company_name:
             messagebox.showerror("Error", "Please enter a company name.")
             return
 
-        # Search for the company name in the CSV file paths
-        matching_paths = [path for path in self.stock_data_paths if company_name.lower() in path.lower()]
+        # Search for the company name among the prepared basenames
+        query = company_name.lower()
+        matching_paths = [path for name, path in self._lower_basenames.items()
+                          if query in name]
         if not matching_paths:
             messagebox.showerror("Error", f"No CSV files found for company '{company_name}'.")
             return
 
-        analyzer = StockAnalysis(matching_paths)
-        analyzer.collect_data()
-        analyzer.preprocess_data()
-        analyzer.build_models()
-        analyzer.evaluate_models()
-
-        # Execute trades
-        executed_trades = analyzer.execute_trades()
-        trade_info = ""
-        for company, trade_data in executed_trades.items():
-            trade_info += f"Company: {company}\n"
-            trade_info += f"Action: {trade_data['Action']}\n"
-            trade_info += f"Price: {trade_data['Price']}\n"
-            trade_info += f"Future Price: {trade_data['Future Price']}\n\n"
+        future = self._pool.submit(self._run_analysis, matching_paths)
+        future.add_done_callback(
+            lambda f: self.master.after(0, lambda: self._show_trades(f)))
+
+    def _run_analysis(self, matching_paths):
+        """
+        Run the analysis for the matching companies off the Tk thread.
+
+        Args:
+            matching_paths (list): CSV paths for the matched companies.
+
+        Returns:
+            dict: Executed trades keyed by company.
+        """
+        # Execute trades, reusing cached analyzers for repeat searches
+        executed_trades = {}
+        for path in matching_paths:
+            executed_trades.update(_analyze(path).execute_trades())
+        return executed_trades
+
+    def _show_trades(self, future):
+        """
+        Display the finished analysis; runs back on the Tk main thread.
+
+        Args:
+            future (Future): The completed analysis future.
+        """
+        try:
+            executed_trades = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Analysis failed: {e}")
+            return
+
+        trade_info = "\n\n".join(
+            f"Company: {company}\n"
+            f"Action: {trade_data['Action']}\n"
+            f"Price: {trade_data['Price']}\n"
+            f"Future Price: {trade_data['Future Price']}"
+            for company, trade_data in executed_trades.items())
 
         messagebox.showinfo("Trade Information", trade_info)
 
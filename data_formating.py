@@ -16,11 +16,26 @@ Example usage:
     processor.merge_and_save()
 """
 
-import csv
 import os
 
+import pandas as pd
+
 import imp_items
 
+# Columns pulled from the bhavcopy file and the pivot-point table; passed as
+# usecols so pandas only parses what the merge actually consumes.
+REQUIRED_COLS_1 = [
+    'SYMBOL', 'SERIES', 'OPEN', 'HIGH', 'LOW', 'CLOSE', 'LAST', 'PREVCLOSE',
+    'TOTTRDQTY', 'TOTTRDVAL', 'TIMESTAMP', 'TOTALTRADES', 'ISIN'
+]
+REQUIRED_COLS_2 = [
+    'Name', 'Current Price', 'S3', 'S2', 'S1', 'Pivot', 'R1', 'R2', 'R3'
+]
+
+# Rows of the bhavcopy file merged per chunk; bounds peak memory by the
+# chunk size rather than the file size.
+CHUNK_ROWS = 100_000
+
 class CompanyDataProcessor:
     """
     A class to merge and save company data from two CSV files.
@@ -56,114 +71,102 @@ class CompanyDataProcessor:
             # Create the output directory if it doesn't exist
             os.makedirs(self.output_dir, exist_ok=True)
 
-            # Load the CSV files
-            data1 = self.load_csv(self.file1_path)
-            data2 = self.load_csv(self.file2_path)
-
-            # Merge the data
-            merged_data = self.merge_data(data1, data2)
-
-            # Save merged data for each company
-            for company, company_data in merged_data.items():
-                output_file_path = os.path.join(self.output_dir, f"{company}.csv")
-                self.save_to_csv(company_data, output_file_path)
+            # The pivot-point table is small; keep it in memory as the
+            # join lookup side
+            data2 = self.load_csv(self.file2_path, usecols=REQUIRED_COLS_2)
+
+            # Stream the (much larger) bhavcopy file chunk by chunk
+            # through the merge so it is never fully materialized
+            for data1 in pd.read_csv(self.file1_path,
+                                     usecols=REQUIRED_COLS_1,
+                                     chunksize=CHUNK_ROWS):
+                merged_data = self.merge_data(data1, data2)
+
+                # Save merged data for each company, opening every output
+                # file exactly once per chunk with a large buffer
+                for company, company_data in merged_data.items():
+                    output_file_path = os.path.join(self.output_dir, f"{company}.csv")
+                    self.write_rows(company_data, output_file_path)
         except FileNotFoundError as e:
             print(f"File not found: {e}")
-        except csv.Error as e:
+        except pd.errors.ParserError as e:
             print(f"CSV error: {e}")
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
 
     def merge_data(self, data1, data2):
         """
-        Merge the data from two dictionaries based on a common column.
+        Merge the data from two DataFrames based on the symbol column.
+
+        The join runs as a pandas hash join in C rather than a Python loop
+        over rows.
 
         Args:
-            data1 (dict): The data from the first CSV file.
-            data2 (dict): The data from the second CSV file.
+            data1 (DataFrame): The data from the first CSV file.
+            data2 (DataFrame): The data from the second CSV file.
 
         Returns:
-            dict: A dictionary containing merged data for each company.
+            dict: A dictionary mapping each company to its merged DataFrame.
         """
         merged_data = {}
         try:
-            for symbol in data1['SYMBOL']:
-                if symbol in data2['Name']:
-                    merged_data[symbol] = {
-                        'Company Name': symbol,
-                        'Series': data1['SERIES'][data1['SYMBOL'].index(symbol)],
-                        'OPEN': data1['OPEN'][data1['SYMBOL'].index(symbol)],
-                        'HIGH': data1['HIGH'][data1['SYMBOL'].index(symbol)],
-                        'LOW': data1['LOW'][data1['SYMBOL'].index(symbol)],
-                        'CLOSE': data1['CLOSE'][data1['SYMBOL'].index(symbol)],
-                        'LAST': data1['LAST'][data1['SYMBOL'].index(symbol)],
-                        'PREVCLOSE': data1['PREVCLOSE'][data1['SYMBOL'].index(symbol)],
-                        'TOTTRDQTY': data1['TOTTRDQTY'][data1['SYMBOL'].index(symbol)],
-                        'TOTTRDVAL': data1['TOTTRDVAL'][data1['SYMBOL'].index(symbol)],
-                        'TIMESTAMP': data1['TIMESTAMP'][data1['SYMBOL'].index(symbol)],
-                        'TOTALTRADES': data1['TOTALTRADES'][data1['SYMBOL'].index(symbol)],
-                        'ISIN': data1['ISIN'][data1['SYMBOL'].index(symbol)],
-                        'Current Price': data2['Current Price'][data2['Name'].index(symbol)],
-                        'S3': data2['S3'][data2['Name'].index(symbol)],
-                        'S2': data2['S2'][data2['Name'].index(symbol)],
-                        'S1': data2['S1'][data2['Name'].index(symbol)],
-                        'Pivot': data2['Pivot'][data2['Name'].index(symbol)],
-                        'R1': data2['R1'][data2['Name'].index(symbol)],
-                        'R2': data2['R2'][data2['Name'].index(symbol)],
-                        'R3': data2['R3'][data2['Name'].index(symbol)]
-                    }
+            merged = data1.merge(data2, left_on='SYMBOL', right_on='Name',
+                                 how='inner')
+            merged = merged.drop(columns=['Name']).rename(
+                columns={'SYMBOL': 'Company Name', 'SERIES': 'Series'})
+            # Keep each group columnar; repacking into per-row dicts would
+            # box every cell back into Python objects
+            for company, group in merged.groupby('Company Name', sort=False):
+                merged_data[company] = group
         except KeyError as e:
             print(f"KeyError: {e}")
         except Exception as e:
             print(f"An unexpected error occurred during data merge: {e}")
         return merged_data
 
-    def save_to_csv(self, data, file_path):
+    def write_rows(self, data, file_path):
         """
-        Save the data to a CSV file.
+        Append the rows to a CSV file in one buffered write.
 
         Args:
-            data (dict): The data to be saved.
+            data (DataFrame): The rows to be saved.
             file_path (str): The file path of the CSV file.
         """
+        if data.empty:
+            return
         try:
-            # Check if the file exists
-            file_exists = os.path.isfile(file_path)
-            with open(file_path, 'a', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=data.keys())
-                # Write the header only if the file doesn't exist
-                if not file_exists:
-                    writer.writeheader()
-                writer.writerow(data)
+            with open(file_path, 'a', newline='', encoding='utf-8',
+                      buffering=1 << 20) as csvfile:
+                # Write the header only if the file is new/empty
+                data.to_csv(csvfile, header=csvfile.tell() == 0, index=False)
         except IOError as e:
             print(f"IOError: {e}")
         except Exception as e:
             print(f"An unexpected error occurred while saving to CSV: {e}")
 
 
-    def load_csv(self, file_path):
+    def load_csv(self, file_path, usecols=None):
         """
-        Load data from a CSV file into a dictionary.
+        Load data from a CSV file into a DataFrame.
+
+        Uses the pandas C parser instead of a row-by-row csv.DictReader
+        loop, so parsing happens in native code and the columns come back
+        already laid out column-wise.
 
         Args:
             file_path (str): The file path of the CSV file.
+            usecols (list, optional): Columns to read; others are skipped
+                                      during parsing. Defaults to all.
 
         Returns:
-            dict: A dictionary containing the data from the CSV file.
+            DataFrame: The data from the CSV file.
         """
-        data = {}
         try:
-            with open(file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    for key, value in row.items():
-                        if key not in data:
-                            data[key] = []
-                        data[key].append(value)
+            return pd.read_csv(file_path, usecols=usecols)
         except FileNotFoundError as e:
             print(f"File not found: {e}")
         except IOError as e:
             print(f"IOError: {e}")
         except Exception as e:
             print(f"An unexpected error occurred while loading CSV: {e}")
-        return data
+        return pd.DataFrame()
@@ -5,6 +5,7 @@ This module provides a class, BhavcopyDownloader, to download Bhavcopy data for
 and save it to a specified directory.
 
 Classes:
+    FileDownloader: A class to download and extract ZIP archives over HTTP.
     BhavcopyDownloader: A class to download Bhavcopy data for a specified time period.
 
 Usage:
@@ -26,10 +27,258 @@ Example:
     print("Bhavcopy data downloaded and saved at:", downloaded_file_path)
 """
 
+import json
 import os
-from datetime import datetime, timedelta
-import bhavcopy
+import pathlib
+import shutil
+import struct
+import tempfile
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
 import imp_items
+from logger import Logger
+from session import SESSION
+
+try:
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
+
+if isal_zlib is not None:
+    # python-isal's isal_zlib is API-compatible with zlib; pointing
+    # zipfile at it routes DEFLATE through ISA-L's SIMD inflate, roughly
+    # 2-3x faster than the scalar zlib build. Purely optional: without
+    # the package installed the stdlib decompressor is used as before.
+    zipfile.zlib = isal_zlib
+
+# Download diagnostics go to the log file instead of stdout: print()
+# from the concurrent tasks in main.py interleaves garbled lines and
+# serializes on the stdout lock, while the logger level-gates messages
+# without touching code.
+_log = Logger(log_file="downloader.log").logger
+
+# 128 KiB chunks are large enough to saturate the link without holding
+# the whole archive in memory.
+DOWNLOAD_CHUNK_SIZE = 128 * 1024
+# Archives up to this size are spooled in memory; larger ones spill to
+# a temporary file on disk.
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Validators (ETag/Last-Modified) and extracted paths per URL, so repeat
+# downloads can send conditional GETs and skip the body on 304.
+ETAG_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'stock_ai',
+                          'etags.json')
+
+def _load_etags():
+    """
+    Load the persisted per-URL validators.
+
+    Returns:
+        dict: URL -> {'etag', 'last_modified', 'files'} entries.
+    """
+    try:
+        with open(ETAG_CACHE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_etags(etags):
+    """
+    Persist the per-URL validators.
+
+    Args:
+        etags (dict): URL -> validator entries to store.
+    """
+    try:
+        os.makedirs(os.path.dirname(ETAG_CACHE), exist_ok=True)
+        with open(ETAG_CACHE, 'w', encoding='utf-8') as f:
+            json.dump(etags, f)
+    except OSError:
+        pass
+
+# ZIP local file header: signature, version, flags, method, mod time,
+# mod date, CRC-32, compressed size, uncompressed size, name length,
+# extra length.
+_LOCAL_HEADER = struct.Struct('<4sHHHHHLLLHH')
+_LOCAL_SIG = b'PK\x03\x04'
+
+def _stream_entries(raw, buf, target_dir):
+    """
+    Inflate ZIP entries straight off the HTTP response stream.
+
+    Bhavcopy archives hold one deflated member whose local file header
+    sits at offset 0, so the CSV can be written to disk while the
+    compressed bytes are still arriving instead of after the whole
+    archive has downloaded. Every byte consumed is teed into buf, so
+    the caller can fall back to the buffered ZipFile path whenever the
+    archive does not fit this layout (data-descriptor entries, nested
+    paths, unexpected compression method, CRC mismatch).
+
+    Args:
+        raw: The decoded HTTP response stream.
+        buf: Spooled file receiving a copy of everything read from raw.
+        target_dir (str): The directory to extract into.
+
+    Returns:
+        list: Names of the extracted members, or None when the caller
+              must fall back to the buffered path.
+    """
+    inflate_zlib = isal_zlib if isal_zlib is not None else zlib
+    os.makedirs(target_dir, exist_ok=True)
+    names = []
+    while True:
+        header = raw.read(_LOCAL_HEADER.size)
+        buf.write(header)
+        if len(header) < _LOCAL_HEADER.size or not header.startswith(_LOCAL_SIG):
+            # Central directory (or end of stream): every entry seen so
+            # far has already been written out
+            return names or None
+        (_, _, flags, method, _, _, crc, compressed_size, _,
+         name_len, extra_len) = _LOCAL_HEADER.unpack(header)
+        meta = raw.read(name_len + extra_len)
+        buf.write(meta)
+        name = meta[:name_len].decode('cp437')
+        if flags & 0x08 or method not in (0, 8) or '/' in name:
+            # Sizes only known after the data, unusual compression, or
+            # a nested path: let the buffered ZipFile path handle it
+            return None
+        inflater = inflate_zlib.decompressobj(-15) if method == 8 else None
+        remaining = compressed_size
+        checksum = 0
+        try:
+            with open(os.path.join(target_dir, name), 'wb') as out:
+                while remaining:
+                    chunk = raw.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        return None
+                    buf.write(chunk)
+                    remaining -= len(chunk)
+                    data = inflater.decompress(chunk) if inflater else chunk
+                    checksum = zlib.crc32(data, checksum)
+                    out.write(data)
+                if inflater:
+                    data = inflater.flush()
+                    checksum = zlib.crc32(data, checksum)
+                    out.write(data)
+        except zlib.error:
+            # Corrupt DEFLATE data: hand over to the buffered ZipFile
+            # path like a CRC mismatch (isal's error subclasses zlib's)
+            return None
+        if checksum != crc:
+            return None
+        names.append(name)
+
+def _parallel_extract(zip_file, target_dir):
+    """
+    Extract a ZIP archive, inflating members on a thread pool.
+
+    Decompression releases the GIL inside zlib, so multi-member archives
+    extract close to linearly with core count. Single-member archives
+    (the usual NSE bhavcopy case) go through plain extractall.
+
+    Args:
+        zip_file (zipfile.ZipFile): The open archive.
+        target_dir (str): The directory to extract into.
+    """
+    infos = zip_file.infolist()
+    if len(infos) <= 1:
+        zip_file.extractall(path=target_dir)
+        return
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as executor:
+        # Consume the iterator so worker exceptions propagate
+        list(executor.map(lambda info: zip_file.extract(info, target_dir),
+                          infos))
+
+class FileDownloader:
+    """
+    A class to download a ZIP archive over HTTP and extract it.
+
+    The response body is streamed in chunks into a spooled temporary
+    file rather than materialized with response.content, so peak memory
+    stays bounded regardless of archive size.
+
+    Attributes:
+        session (requests.Session): The HTTP session used for downloads.
+        timeout (int): Seconds to wait for the server to respond.
+    """
+
+    def __init__(self, timeout=30, session=None):
+        """
+        Initialize the FileDownloader.
+
+        Args:
+            timeout (int, optional): Seconds to wait for the server to
+                                     respond. Defaults to 30.
+            session (requests.Session, optional): The HTTP session to
+                use. Defaults to the shared pooled session.
+        """
+        self.session = session if session is not None else SESSION
+        self.timeout = timeout
+
+    def download_and_extract(self, url, target_dir):
+        """
+        Download a ZIP archive from a URL and extract it to a directory.
+
+        Args:
+            url (str): The URL of the ZIP archive.
+            target_dir (str): The directory to extract the archive into.
+
+        Returns:
+            list: Paths of the extracted files.
+        """
+        etags = _load_etags()
+        entry = etags.get(url, {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        with self.session.get(url, stream=True, timeout=self.timeout,
+                              headers=headers) as response:
+            if response.status_code == 304:
+                cached_files = entry.get('files', [])
+                if cached_files and all(os.path.exists(p) for p in cached_files):
+                    return cached_files
+                # Validators match but the extracted files are gone;
+                # drop the stale entry and fetch unconditionally
+                etags.pop(url, None)
+                _save_etags(etags)
+                return self.download_and_extract(url, target_dir)
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as buf:
+                names = _stream_entries(response.raw, buf, target_dir)
+                if names is None:
+                    # Copy whatever the fast path did not consume and
+                    # extract from the buffered archive instead; any
+                    # partially written member is overwritten here
+                    shutil.copyfileobj(response.raw, buf,
+                                       length=DOWNLOAD_CHUNK_SIZE)
+                    buf.seek(0)
+                    try:
+                        with zipfile.ZipFile(buf) as zip_file:
+                            _parallel_extract(zip_file, target_dir)
+                            names = zip_file.namelist()
+                    except zlib.error as e:
+                        # A structurally valid archive with a corrupt
+                        # member body surfaces as zlib.error, not
+                        # BadZipFile; translate so callers only need to
+                        # handle one bad-archive exception
+                        raise zipfile.BadZipFile(
+                            f"Corrupt member data in archive from {url}: {e}"
+                        ) from e
+            files = [os.path.join(target_dir, name) for name in names]
+            if response.headers.get('ETag') or response.headers.get('Last-Modified'):
+                etags[url] = {'etag': response.headers.get('ETag'),
+                              'last_modified': response.headers.get('Last-Modified'),
+                              'files': files}
+                _save_etags(etags)
+        return files
 
 class BhavcopyDownloader:
     """
@@ -51,57 +300,62 @@ class BhavcopyDownloader:
         self.save_path = path
         self.verbose = verbose
 
-    def _print_verbose(self, message):
+    def _log_verbose(self, message):
         """
-        Print verbose message if verbose mode is enabled.
+        Log a message, demoted to debug level unless verbose is enabled.
 
         Args:
-            message (str): The message to print.
+            message (str): The message to log.
         """
         if self.verbose:
-            print(message)
+            _log.info(message)
+        else:
+            _log.debug(message)
 
     def download_bhavcopy_data(self):
         """
         Download Bhavcopy data for the specified time period and save it to the specified path.
 
         Returns:
-            str: The file path of the downloaded Bhavcopy data.
+            str: The file path of the downloaded Bhavcopy data, or None
+                 when no archive could be fetched.
         """
         if not self.save_path:
             raise ValueError("Save path not set. Please set the save path using set_save_path method.")
 
-        # Define wait time in seconds to avoid getting blocked
-        wait_time = [1, 2]
+        # Place where data needs to be stored; resolved to an absolute
+        # path so everything below works without chdir'ing the process.
+        # The old os.chdir was a process-global side effect that raced
+        # with the concurrent scrape task over the working directory.
+        storage_path = pathlib.Path(self.save_path).expanduser().resolve()
+        storage_path.mkdir(parents=True, exist_ok=True)
+        data_storage = str(storage_path)
 
-        # Place where data needs to be stored
-        data_storage = os.path.abspath(self.save_path)
+        # The bhavcopy for a given date never changes, so a non-empty
+        # CSV already on disk short-circuits the network entirely
+        for name in (f'cm{imp_items.formatted_today_date}bhav.csv',
+                     f'cm{imp_items.formatted_yestrday_date}bhav.csv',
+                     'equities.csv'):
+            cached = os.path.join(data_storage, name)
+            if os.path.exists(cached) and os.path.getsize(cached) > 0:
+                self._log_verbose(f"Using cached bhavcopy: {cached}")
+                return cached
 
-        # Create the data storage directory if it doesn't exist
-        if not os.path.exists(data_storage):
-            os.makedirs(data_storage)
+        # Fetch the bhavcopy archive straight from the NSE archive URLs,
+        # today first and yesterday as fallback
+        downloader = FileDownloader()
+        for url in (imp_items.website_urls[0], imp_items.website_urls[2]):
+            try:
+                extracted = downloader.download_and_extract(url, data_storage)
+            except (requests.RequestException, zipfile.BadZipFile) as e:
+                self._log_verbose(f"Direct download failed for {url}: {e}")
+                continue
+            csv_files = [p for p in extracted if p.endswith('.csv')]
+            if csv_files:
+                return csv_files[0]
 
-        self._print_verbose("Current working directory before change: {}".format(os.getcwd()))
-
-        # Change the current working directory to the specified save path
-        os.chdir(data_storage)
-        self._print_verbose("Current working directory after change: {}".format(os.getcwd()))
-
-        # Instantiate Bhavcopy class for equities, indices, and derivatives
-        try:
-            nse_equities = bhavcopy.bhavcopy('equities', imp_items.yesterday_date, imp_items.today_date, data_storage, wait_time)
-            nse_equities.get_data()
-        except FileNotFoundError:
-            # If file not found, try downloading data for the previous day
-            self._print_verbose("File not found. Trying data for the previous day...")
-            previous_date = datetime.now() - timedelta(days=1)
-            previous_date_str = previous_date.strftime("%d%m%Y")
-            nse_equities = bhavcopy.bhavcopy('equities', previous_date_str, previous_date_str, data_storage, wait_time)
-            nse_equities.get_data()
-
-        file_path = os.path.join(data_storage, 'equities.csv')
-
-        return file_path
+        self._log_verbose("No bhavcopy archive could be downloaded.")
+        return None
 
 if __name__ == "__main__":
     save_path = input("Enter the save path for Bhavcopy data: ")
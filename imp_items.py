@@ -7,26 +7,42 @@ Functions:
     format_date: Format a date string.
 """
 
+import functools
 import os
 from datetime import datetime , timedelta
 
-def format_date(input_date):
+@functools.lru_cache(maxsize=8)
+def _format_date_obj(d):
     """
-    Return the date in the format "26APR2024".
+    Format a date object as "26APR2024", cached per day.
 
     Args:
-        input_date (str): The input date string.
+        d (date): The date to format.
 
     Returns:
         str: The formatted date string.
     """
-    # Parse the input date string
-    parsed_date = datetime.strptime(input_date, '%Y-%m-%d')
+    return d.strftime('%d%b%Y').upper()
+
+def format_date(input_date):
+    """
+    Return the date in the format "26APR2024".
 
-    # Format the date in the desired format
-    formatted_date = parsed_date.strftime('%d%b%Y').upper()
+    Date and datetime objects are formatted directly; a string input is
+    parsed once for backward compatibility. The result is cached per
+    day, so the repeated calls at startup cost one dict lookup.
 
-    return formatted_date
+    Args:
+        input_date (str | date | datetime): The input date.
+
+    Returns:
+        str: The formatted date string.
+    """
+    if isinstance(input_date, str):
+        input_date = datetime.strptime(input_date, '%Y-%m-%d')
+    if isinstance(input_date, datetime):
+        input_date = input_date.date()
+    return _format_date_obj(input_date)
 
 def find_csv_files(folder):
     """
@@ -45,23 +61,51 @@ def find_csv_files(folder):
                 csv_files.append(os.path.join(root, file))
     return csv_files
 
-today_date = datetime.today()
-yesterday_date = today_date - timedelta(days = 1)
-# Format the date using the format_date function
-formatted_today_date = format_date(today_date.strftime('%Y-%m-%d'))
-formatted_yestrday_date = format_date(yesterday_date.strftime('%Y-%m-%d'))
-# List of website URLs
-website_urls = [
-    f'https://nsearchives.nseindia.com/content/historical/EQUITIES/{today_date.strftime("%Y")}/{today_date.strftime("%b").upper()}/cm{formatted_today_date}bhav.csv.zip',
-    'https://www.topstockresearch.com/rt/Screener/Technical/PivotPoint/StandardPivotPoint/ListSupportOrResistance',
-    f'https://nsearchives.nseindia.com/content/historical/EQUITIES/{yesterday_date.strftime("%Y")}/{yesterday_date.strftime("%b").upper()}/cm{formatted_yestrday_date}bhav.csv.zip'
-]
-
-# Path to the "Documents" folder
-documents_folder = os.path.join(os.path.expanduser("~"), 'Documents')
-base_path = os.path.join(documents_folder, 'stock_ai')
-# List of paths
-paths = [base_path,os.path.join(base_path,'data'),os.path.join(base_path,'results'),os.path.join(base_path,'data','company_wise_data')]
-
-print(website_urls)
-print(paths)
+@functools.cache
+def _computed():
+    """
+    Build the date-dependent module values on first use.
+
+    Computing these lazily keeps importing this module cheap for every
+    caller and means the dates reflect when they are first needed, not
+    when the interpreter happened to import the module.
+
+    Returns:
+    dict: The module attribute values keyed by name.
+    """
+    today_date = datetime.today()
+    yesterday_date = today_date - timedelta(days = 1)
+    # Format the dates directly, without a strftime/strptime round-trip
+    formatted_today_date = format_date(today_date)
+    formatted_yestrday_date = format_date(yesterday_date)
+    # List of website URLs
+    website_urls = [
+        f'https://nsearchives.nseindia.com/content/historical/EQUITIES/{today_date.strftime("%Y")}/{today_date.strftime("%b").upper()}/cm{formatted_today_date}bhav.csv.zip',
+        'https://www.topstockresearch.com/rt/Screener/Technical/PivotPoint/StandardPivotPoint/ListSupportOrResistance',
+        f'https://nsearchives.nseindia.com/content/historical/EQUITIES/{yesterday_date.strftime("%Y")}/{yesterday_date.strftime("%b").upper()}/cm{formatted_yestrday_date}bhav.csv.zip'
+    ]
+
+    # Path to the "Documents" folder
+    documents_folder = os.path.join(os.path.expanduser("~"), 'Documents')
+    base_path = os.path.join(documents_folder, 'stock_ai')
+    # List of paths
+    paths = [base_path,os.path.join(base_path,'data'),os.path.join(base_path,'results'),os.path.join(base_path,'data','company_wise_data')]
+
+    return {
+        'today_date': today_date,
+        'yesterday_date': yesterday_date,
+        'formatted_today_date': formatted_today_date,
+        'formatted_yestrday_date': formatted_yestrday_date,
+        'website_urls': website_urls,
+        'paths': paths,
+    }
+
+def __getattr__(name):
+    """
+    Resolve the lazily computed module attributes (PEP 562).
+    """
+    try:
+        return _computed()[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}") from None
@@ -1,5 +1,5 @@
+import asyncio
 import os
-import threading
 import data_formating as data_format
 import file_downloader as fd
 import web_copier as wc
@@ -19,24 +19,29 @@ def html_copy():
     web_copier = wc.WebTableCopier()
     web_copier.save_tables_from_url(WEBSITE_URL, OUTPUT_DIR)
 
-# Run the file and HTML copying processes simultaneously
-if __name__ == "__main__":
-    # Create threads for each process
-    file_thread = threading.Thread(target=file)
-    html_copy_thread = threading.Thread(target=html_copy)
+async def gather_data():
+    """
+    Run the bhavcopy download and the table scrape concurrently.
 
-    # Start both threads
-    file_thread.start()
-    html_copy_thread.start()
+    Both tasks are blocking I/O, so they are pushed to worker threads
+    and awaited together; the download's return value is captured
+    instead of downloading a second time to obtain it.
 
-    # Wait for both threads to finish
-    file_thread.join()
-    html_copy_thread.join()
+    Returns:
+        str: The path of the downloaded bhavcopy CSV, or None.
+    """
+    path1, _ = await asyncio.gather(
+        asyncio.to_thread(file, OUTPUT_DIR),
+        asyncio.to_thread(html_copy))
+    return path1
 
-    # After both threads have finished, merge and save the data
-    path1 = file(OUTPUT_DIR)
+# Run the file and HTML copying processes simultaneously
+if __name__ == "__main__":
+    path1 = asyncio.run(gather_data())
     if path1 is None:
         path1 = file(second_OUTPUT_DIR)
+
+    # After both tasks have finished, merge and save the data
     processor = data_format.CompanyDataProcessor(path1, os.path.join(OUTPUT_DIR, 'table.csv'))
     processor.merge_and_save()
     GUI.main()
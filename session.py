@@ -0,0 +1,28 @@
+"""
+Module: session
+
+This module provides the shared HTTP session used by all network code.
+
+Both the bhavcopy downloader and the web table copier talk to their
+hosts through this one pooled session, so TCP/TLS connections, DNS
+results and retry policy are shared instead of re-established per
+component.
+
+Example usage:
+    from session import SESSION
+
+    response = SESSION.get(url, timeout=10)
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# Transient 429/5xx responses are retried with backoff inside the
+# connection pool, which reuses the warm socket and honors Retry-After.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.5,
+                      status_forcelist=(429, 500, 502, 503, 504),
+                      respect_retry_after_header=True)))
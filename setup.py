@@ -11,13 +11,24 @@ class DirectorySetup:
         """
         self.dir_paths = imp_items.paths
 
-    def create_directories(self):
+    def create_directories(self, verbose=False):
         """
         Create directories if they do not exist.
+
+        Only the deepest leaf paths are passed to os.makedirs; the
+        parent chain is built by makedirs itself, so nested prefixes in
+        the list are not stat'd and re-created several times over.
+
+        Args:
+        - verbose (bool): Whether to print each created directory.
         """
-        for dir_path in self.dir_paths:
+        leaves = [p for p in self.dir_paths
+                  if not any(q != p and q.startswith(p + os.sep)
+                             for q in self.dir_paths)]
+        for dir_path in leaves:
             os.makedirs(dir_path, exist_ok=True)
-            print(f"Directory created: {dir_path}")
+            if verbose:
+                print(f"Directory created: {dir_path}")
 
 if __name__ == "__main__":
 
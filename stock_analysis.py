@@ -1,160 +1,467 @@
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import mean_squared_error
-
-class StockAnalysis:
-    """
-    A class to perform analysis on stock market data.
-
-    Attributes:
-    stock_data_paths (list): A list of paths to CSV files containing historical stock market data for different companies.
-    dfs (list): A list to store dataframes for each company.
-    models (list): A list to store trained models for each company.
-    """
-
-    def __init__(self, stock_data_paths):
-        """
-        Initialize StockAnalysis object with a list of stock data paths.
-
-        Args:
-        stock_data_paths (list): A list of paths to CSV files containing historical stock market data.
-        """
-        self.stock_data_paths = stock_data_paths
-        self.dfs = []
-        self.models = []
-
-    def collect_data(self):
-        """
-        Read data for each company from CSV files and store in dataframes.
-        """
-        for path in self.stock_data_paths:
-            df = pd.read_csv(path)
-            required_headers = [
-                "Company Name", "Series", "OPEN", "HIGH", "LOW", "CLOSE", "LAST",
-                "PREVCLOSE", "TOTTRDQTY", "TOTTRDVAL", "TIMESTAMP", "TOTALTRADES",
-                "ISIN", "Current Price", "S3", "S2", "S1", "Pivot", "R1", "R2", "R3"
-            ]
-            if all(header in df.columns for header in required_headers):
-                self.dfs.append(df)
-            else:
-                print(f"CSV file '{path}' is missing required headers. Skipping...")
-
-    def preprocess_data(self):
-        """
-        Perform comprehensive preprocessing on the data.
-
-        This method performs various preprocessing steps including handling missing values,
-        encoding categorical variables, feature engineering, scaling, handling outliers,
-        and preparing the data for modeling.
-        """
-        for df in self.dfs:
-            # Select only numeric columns for median calculation
-            numeric_cols = df.select_dtypes(include=np.number).columns
-            df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].median())  # Impute missing values with column medians
-
-            self.encode_categorical(df)
-
-            df['MA_5'] = df['CLOSE'].rolling(window=5).mean()
-
-            # Scale numeric columns between 0 and 1
-            df[numeric_cols] = (df[numeric_cols] - df[numeric_cols].min()) /(df[numeric_cols].max() - df[numeric_cols].min())
-
-            # Clip outliers
-            df[numeric_cols] = df[numeric_cols].apply(lambda x: np.clip(
-                x,
-                x.quantile(0.25) - 1.5 * (x.quantile(0.75) - x.quantile(0.25)),
-                x.quantile(0.75) + 1.5 * (x.quantile(0.75) - x.quantile(0.25))
-            ))
-
-    def encode_categorical(self, df):
-        """
-        Encode categorical variables in the DataFrame.
-
-        Args:
-        df (DataFrame): DataFrame containing historical stock market data.
-        """
-        categorical_cols = df.select_dtypes(include=['object']).columns
-        label_encoders = {col: LabelEncoder() for col in categorical_cols}
-        for col, le in label_encoders.items():
-            df[col] = le.fit_transform(df[col])
-
-    def build_models(self):
-        """
-        Train a separate model for each company.
-        """
-        self.models = [RandomForestRegressor(n_estimators=100, random_state=42).fit(
-            df[['MA_5']], df['CLOSE']) for df in self.dfs]
-
-    def evaluate_models(self):
-        """
-        Evaluate the performance of each model.
-        """
-        for df, model in zip(self.dfs, self.models):
-            x_test, y_test = df[['MA_5']].values, df['CLOSE'].values
-            predictions = model.predict(x_test)
-            mse = mean_squared_error(y_test, predictions)
-            print("Mean Squared Error:", mse)
-
-    def buy_or_sell(self, threshold=0.05):
-        """
-        Make buying or selling decisions based on predicted future prices.
-
-        Args:
-        threshold (float): A threshold for price change percentage to trigger buying or selling. Default is 0.05 (5%).
-
-        Returns:
-        dict: A dictionary containing buying or selling decisions for each company.
-        """
-        decisions = {}
-        for i, df in enumerate(self.dfs):
-            company_name = df["Company Name"].iloc[0]
-            current_price = df["CLOSE"].iloc[-1]
-            future_price = self.models[i].predict(df[["MA_5"]].iloc[[-1]])[0]
-
-            price_change = (future_price - current_price) / current_price
-            if abs(price_change) >= threshold:
-                decision = "Buy" if price_change > 0 else "Sell"
-            else:
-                decision = "Hold"
-
-            decisions[company_name] = {
-                "Current Price": current_price,
-                "Future Price": future_price,
-                "Price Change": price_change,
-                "Decision": decision
-            }
-        return decisions
-
-    def execute_trades(self):
-        """
-        Execute buy or sell trades based on the decisions.
-
-        Returns:
-        dict: A dictionary containing executed trades for each company.
-        """
-        trades = {}
-        for company, decision_data in self.buy_or_sell().items():
-            decision = decision_data["Decision"]
-            current_price = decision_data["Current Price"]
-            future_price = decision_data["Future Price"]
-
-            if decision == "Buy":
-                # Execute buy trade
-                trades[company] = {
-                    "Action": "Buy",
-                    "Price": current_price,
-                    "Future Price": future_price
-                }
-                # You can add your trading logic here, such as placing a buy order.
-            elif decision == "Sell":
-                # Execute sell trade
-                trades[company] = {
-                    "Action": "Sell",
-                    "Price": current_price,
-                    "Future Price": future_price
-                }
-                # You can add your trading logic here, such as placing a sell order.
-        return trades
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import pandas as pd
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.metrics import mean_squared_error
+
+import imp_items
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Fitted models are cached here, keyed on the source CSV, so repeat runs
+# (e.g. clicking Analyze twice in the GUI) skip retraining entirely.
+MODEL_CACHE_DIR = os.path.join(imp_items.paths[0], 'model_cache')
+
+def _rolling_mean(values, window):
+    """
+    Rolling mean over a 1-D float array via a running sum.
+
+    One add and one subtract per element instead of re-summing the whole
+    window, with NaN padding for the first window-1 slots like pandas.
+
+    Args:
+    values (ndarray): The input values.
+    window (int): The window width.
+
+    Returns:
+    ndarray: The rolling means.
+    """
+    out = np.full(values.size, np.nan)
+    if values.size >= window:
+        csum = np.cumsum(values)
+        out[window - 1] = csum[window - 1] / window
+        out[window:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+def _scale_clip_kernel(arr):
+    """
+    Fused min-max scaling and IQR outlier clipping over a 2D array.
+
+    Each column is scaled to [0, 1] and clipped to the 1.5*IQR fences in
+    a single in-place sweep, instead of separate pandas passes that each
+    allocate an intermediate frame.
+
+    Args:
+    arr (ndarray): 2D float array, one column per numeric feature.
+                   Modified in place.
+
+    Returns:
+    ndarray: The scaled and clipped array (same object as arr).
+    """
+    for j in range(arr.shape[1]):
+        col = arr[:, j]
+        mn = np.min(col)
+        rng = np.max(col) - mn
+        if rng == 0.0:
+            # Constant column: map to 0 instead of dividing by zero
+            rng = 1.0
+        col -= mn
+        col /= rng
+        q1 = np.percentile(col, 25)
+        q3 = np.percentile(col, 75)
+        iqr = q3 - q1
+        col[:] = np.minimum(q3 + 1.5 * iqr, np.maximum(q1 - 1.5 * iqr, col))
+    return arr
+
+if njit is not None:
+    # Compile the numeric kernels when numba is available; cache=True
+    # persists the compiled code so later runs skip the JIT warmup.
+    _rolling_mean = njit(cache=True)(_rolling_mean)
+    _scale_clip_kernel = njit(cache=True)(_scale_clip_kernel)
+
+REQUIRED_HEADERS = [
+    "Company Name", "Series", "OPEN", "HIGH", "LOW", "CLOSE", "LAST",
+    "PREVCLOSE", "TOTTRDQTY", "TOTTRDVAL", "TIMESTAMP", "TOTALTRADES",
+    "ISIN", "Current Price", "S3", "S2", "S1", "Pivot", "R1", "R2", "R3"
+]
+
+# Explicit column dtypes so the C parser allocates the final buffers
+# during the read instead of running a type-inference pass per column;
+# float32 for the price columns also halves downstream memory traffic.
+CSV_DTYPES = {
+    'OPEN': 'float32', 'HIGH': 'float32', 'LOW': 'float32',
+    'CLOSE': 'float32', 'LAST': 'float32', 'PREVCLOSE': 'float32',
+    'TOTTRDQTY': 'int64', 'TOTTRDVAL': 'float64', 'TOTALTRADES': 'int32',
+    'Current Price': 'float32', 'S3': 'float32', 'S2': 'float32',
+    'S1': 'float32', 'Pivot': 'float32', 'R1': 'float32', 'R2': 'float32',
+    'R3': 'float32',
+    # Parsed as category so the factorization happens in C during the
+    # read instead of materializing boxed Python strings first
+    'Series': 'category', 'ISIN': 'category',
+}
+
+def _read_company_csv(path):
+    """
+    Read a company CSV with the explicit schema.
+
+    Args:
+    path (str): Path to the company's CSV file.
+
+    Returns:
+    DataFrame: The company's data.
+    """
+    try:
+        # usecols pushes the projection into the parser: columns outside
+        # the required set are never tokenized or allocated
+        return pd.read_csv(path, usecols=REQUIRED_HEADERS, dtype=CSV_DTYPES,
+                           parse_dates=['TIMESTAMP'], engine='c')
+    except (ValueError, TypeError):
+        # Fall back to plain inference for files that do not match the
+        # schema; the required-headers check downstream reports them.
+        return pd.read_csv(path)
+
+def _column_classes(df):
+    """
+    Classify a frame's columns as numeric, category or object.
+
+    select_dtypes walks the whole dtype table, and the classification is
+    invariant for a given schema, so it is computed once per frame and
+    cached on df.attrs instead of re-derived by every preprocessing step.
+
+    Args:
+    df (DataFrame): DataFrame containing historical stock market data.
+
+    Returns:
+    tuple: (numeric, category, object) column Index objects.
+    """
+    if 'column_classes' not in df.attrs:
+        df.attrs['column_classes'] = (
+            df.select_dtypes(include=np.number).columns,
+            df.select_dtypes(include=['category']).columns,
+            df.select_dtypes(include=['object']).columns)
+    return df.attrs['column_classes']
+
+def _encode_categorical(df):
+    """
+    Encode categorical variables in the DataFrame in place.
+
+    Args:
+    df (DataFrame): DataFrame containing historical stock market data.
+    """
+    _, category_cols, object_cols = _column_classes(df)
+    # Columns read as category are already factorized; taking the codes
+    # is effectively free
+    for col in category_cols:
+        df[col] = df[col].cat.codes.astype(np.int32)
+    for col in object_cols:
+        # pd.factorize hashes the column in one C-level pass, unlike
+        # the per-column sklearn LabelEncoder it replaces
+        df[col] = pd.factorize(df[col])[0].astype(np.int32)
+
+def _preprocess_frame(df):
+    """
+    Preprocess a single company's DataFrame in place.
+
+    Handles missing values, categorical encoding, the MA_5 feature,
+    min-max scaling and IQR outlier clipping.
+
+    Args:
+    df (DataFrame): DataFrame containing historical stock market data.
+
+    Returns:
+    DataFrame: The same frame, returned so parallel workers can ship the
+               preprocessed copy back to the parent process.
+    """
+    numeric_cols = _column_classes(df)[0]
+    # Impute missing values with column medians; numeric_only skips the
+    # per-column dtype dispatch and the fill happens in place instead of
+    # materializing and re-assigning a numeric sub-frame
+    med = df.median(numeric_only=True)
+    df.fillna(med, inplace=True)
+
+    _encode_categorical(df)
+
+    df['MA_5'] = _rolling_mean(df['CLOSE'].to_numpy(dtype=np.float64), 5)
+
+    # Scale to [0, 1] and clip outliers in one fused pass per column
+    arr = df[numeric_cols].to_numpy(dtype=np.float64)
+    df[numeric_cols] = _scale_clip_kernel(arr)
+    return df
+
+def _features(df):
+    """
+    Extract the model input and target arrays from a preprocessed frame.
+
+    Pulled out once per frame because every .values/.to_numpy on a
+    column slice allocates a fresh array; training, evaluation and
+    prediction all reuse these.
+
+    Args:
+    df (DataFrame): The preprocessed DataFrame for one company.
+
+    Returns:
+    tuple: (X, y) numpy arrays for the model.
+    """
+    X = df['MA_5'].to_numpy(dtype=np.float32)[:, None]
+    y = df['CLOSE'].to_numpy(dtype=np.float32)
+    return X, y
+
+def _split_features(X, y):
+    """
+    Split a company's feature arrays into train and holdout portions.
+
+    The split is unshuffled, so the holdout is the most recent 20% of
+    the series (no look-ahead leakage) and is reproducible from the
+    cached X/y arrays without stashing it alongside the pickled model.
+
+    Args:
+    X (ndarray): The model input array.
+    y (ndarray): The target array.
+
+    Returns:
+    tuple: (X_train, X_test, y_train, y_test).
+    """
+    return train_test_split(X, y, test_size=0.2, shuffle=False)
+
+def _model_cache_path(path):
+    """
+    Return the cache file for the model trained on the given CSV.
+
+    The key hashes the path together with the file's mtime and size,
+    so editing or replacing a CSV invalidates its cached model.
+
+    Args:
+    path (str): Path to the company's CSV file.
+
+    Returns:
+    str: Path to the joblib cache file for that CSV.
+    """
+    stamp = f"{path}|{os.path.getmtime(path)}|{os.path.getsize(path)}"
+    key = hashlib.sha1(stamp.encode()).hexdigest()
+    return os.path.join(MODEL_CACHE_DIR, f"{key}.joblib")
+
+def _load_or_train_model(path, df):
+    """
+    Load the cached model for a CSV, or train and cache a fresh one.
+
+    Args:
+    path (str): Path to the company's CSV file.
+    df (DataFrame): The preprocessed DataFrame for that company.
+
+    Returns:
+    HistGradientBoostingRegressor: The fitted model.
+    """
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    cache_file = _model_cache_path(path)
+    if os.path.exists(cache_file):
+        return joblib.load(cache_file)
+    # Histogram gradient boosting trains across all cores via OpenMP and
+    # is far lighter than a 100-tree forest on a single MA_5 feature
+    X, y = _features(df)
+    X_train, _, y_train, _ = _split_features(X, y)
+    model = HistGradientBoostingRegressor(max_iter=100,
+                                          random_state=42).fit(X_train, y_train)
+    joblib.dump(model, cache_file)
+    return model
+
+def _process_company(path):
+    """
+    Run the full read -> preprocess -> train pipeline for one company.
+
+    Module-level so it can be dispatched to worker processes.
+
+    Args:
+    path (str): Path to the company's CSV file.
+
+    Returns:
+    tuple: (path, DataFrame, model), with the last two None when the CSV
+           is missing required headers.
+    """
+    df = _read_company_csv(path)
+    if not all(header in df.columns for header in REQUIRED_HEADERS):
+        print(f"CSV file '{path}' is missing required headers. Skipping...")
+        return path, None, None
+    _preprocess_frame(df)
+    return path, df, _load_or_train_model(path, df)
+
+class StockAnalysis:
+    """
+    A class to perform analysis on stock market data.
+
+    Attributes:
+    stock_data_paths (list): A list of paths to CSV files containing historical stock market data for different companies.
+    dfs (list): A list to store dataframes for each company.
+    models (list): A list to store trained models for each company.
+    X (list): Cached model input arrays, one per company.
+    y (list): Cached target arrays, one per company.
+    """
+
+    def __init__(self, stock_data_paths):
+        """
+        Initialize StockAnalysis object with a list of stock data paths.
+
+        Args:
+        stock_data_paths (list): A list of paths to CSV files containing historical stock market data.
+        """
+        self.stock_data_paths = stock_data_paths
+        self.dfs = []
+        self.loaded_paths = []
+        self.models = []
+        self.X = []
+        self.y = []
+
+    def run_pipeline(self):
+        """
+        Read, preprocess and train for every company in parallel.
+
+        Each company's CSV is independent, so the whole per-company
+        pipeline is fanned out across a process pool; preprocessing and
+        model fitting for different companies overlap across cores.
+        """
+        self.dfs = []
+        self.loaded_paths = []
+        self.models = []
+        self.X = []
+        self.y = []
+        with ProcessPoolExecutor() as executor:
+            for path, df, model in executor.map(_process_company,
+                                                self.stock_data_paths):
+                if df is None:
+                    continue
+                self.loaded_paths.append(path)
+                self.dfs.append(df)
+                self.models.append(model)
+                X, y = _features(df)
+                self.X.append(X)
+                self.y.append(y)
+
+    def collect_data(self):
+        """
+        Read data for each company from CSV files and store in dataframes.
+        """
+        for path in self.stock_data_paths:
+            df = _read_company_csv(path)
+            if all(header in df.columns for header in REQUIRED_HEADERS):
+                self.dfs.append(df)
+                self.loaded_paths.append(path)
+            else:
+                print(f"CSV file '{path}' is missing required headers. Skipping...")
+
+    def preprocess_data(self):
+        """
+        Perform comprehensive preprocessing on the data.
+
+        This method performs various preprocessing steps including handling missing values,
+        encoding categorical variables, feature engineering, scaling, handling outliers,
+        and preparing the data for modeling.
+
+        Every company's frame is independent, so the per-frame work is
+        fanned out across cores with joblib, matching build_models.
+        """
+        self.dfs = joblib.Parallel(n_jobs=-1)(
+            joblib.delayed(_preprocess_frame)(df) for df in self.dfs)
+        self.X = []
+        self.y = []
+        for df in self.dfs:
+            X, y = _features(df)
+            self.X.append(X)
+            self.y.append(y)
+
+    def encode_categorical(self, df):
+        """
+        Encode categorical variables in the DataFrame.
+
+        Args:
+        df (DataFrame): DataFrame containing historical stock market data.
+        """
+        _encode_categorical(df)
+
+    def build_models(self):
+        """
+        Train a separate model for each company.
+
+        Fitted models are persisted with joblib and reloaded on later runs
+        as long as the source CSV is unchanged, avoiding a cold retrain on
+        every GUI click. The independent per-company fits are fanned out
+        across cores with joblib.
+        """
+        self.models = joblib.Parallel(n_jobs=-1)(
+            joblib.delayed(_load_or_train_model)(path, df)
+            for path, df in zip(self.loaded_paths, self.dfs))
+
+    def evaluate_models(self):
+        """
+        Evaluate each model on its holdout portion.
+
+        The unshuffled split is recomputed from the cached X/y arrays,
+        so the MSE covers only rows the model never trained on and the
+        prediction pass touches 20% of the data instead of all of it.
+        """
+        for X, y, model in zip(self.X, self.y, self.models):
+            _, x_test, _, y_test = _split_features(X, y)
+            predictions = model.predict(x_test)
+            mse = mean_squared_error(y_test, predictions)
+            print("Mean Squared Error:", mse)
+
+    def buy_or_sell(self, threshold=0.05):
+        """
+        Make buying or selling decisions based on predicted future prices.
+
+        Args:
+        threshold (float): A threshold for price change percentage to trigger buying or selling. Default is 0.05 (5%).
+
+        Returns:
+        dict: A dictionary containing buying or selling decisions for each company.
+        """
+        decisions = {}
+        if not self.dfs:
+            return decisions
+        # One predict call per model is unavoidable (each company has its
+        # own), but the price math and thresholding run as vector ops
+        # over all companies instead of per-iteration Python arithmetic.
+        # The cached feature arrays avoid re-slicing the frames.
+        current = np.array([y[-1] for y in self.y])
+        future = np.array([model.predict(x[-1:])[0]
+                           for model, x in zip(self.models, self.X)])
+        price_change = (future - current) / current
+        labels = np.where(np.abs(price_change) >= threshold,
+                          np.where(price_change > 0, "Buy", "Sell"),
+                          "Hold")
+        for i, df in enumerate(self.dfs):
+            company_name = df["Company Name"].iloc[0]
+            decisions[company_name] = {
+                "Current Price": current[i],
+                "Future Price": future[i],
+                "Price Change": price_change[i],
+                "Decision": str(labels[i])
+            }
+        return decisions
+
+    def execute_trades(self):
+        """
+        Execute buy or sell trades based on the decisions.
+
+        Returns:
+        dict: A dictionary containing executed trades for each company.
+        """
+        trades = {}
+        for company, decision_data in self.buy_or_sell().items():
+            decision = decision_data["Decision"]
+            current_price = decision_data["Current Price"]
+            future_price = decision_data["Future Price"]
+
+            if decision == "Buy":
+                # Execute buy trade
+                trades[company] = {
+                    "Action": "Buy",
+                    "Price": current_price,
+                    "Future Price": future_price
+                }
+                # You can add your trading logic here, such as placing a buy order.
+            elif decision == "Sell":
+                # Execute sell trade
+                trades[company] = {
+                    "Action": "Sell",
+                    "Price": current_price,
+                    "Future Price": future_price
+                }
+                # You can add your trading logic here, such as placing a sell order.
+        return trades
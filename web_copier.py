@@ -15,10 +15,23 @@ Example usage:
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 
+from session import SESSION
+
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    lxml = None
+
+# lxml's C parser is several times faster than the pure-Python
+# html.parser on large pages; fall back when it is not installed.
+_BS4_PARSER = 'lxml' if lxml is not None else 'html.parser'
+
 class WebTableCopier:
     """
     WebTableCopier Class
@@ -26,15 +39,18 @@ class WebTableCopier:
     This class provides a method to copy tables from a given website.
     """
 
-    def __init__(self, timeout=10):
+    def __init__(self, timeout=10, session=None):
         """
         Initialize the WebTableCopier object.
 
         Args:
             timeout (int, optional): The number of seconds to wait for the server to respond.
                                      Defaults to 10 seconds.
+            session (requests.Session, optional): The HTTP session to use.
+                                                  Defaults to the shared pooled session.
         """
         self.timeout = timeout
+        self.session = session if session is not None else SESSION
 
     def save_table_as_csv(self, table, filename):
         """
@@ -45,8 +61,13 @@ class WebTableCopier:
             filename (str): The file path to save the CSV file.
         """
         try:
-            # Convert the table to a DataFrame
-            df = pd.read_html(str(table))[0]
+            # Build the DataFrame straight from the parsed Tag instead
+            # of serializing it back to HTML for read_html to re-lex
+            # and re-parse
+            rows = [[cell.get_text(strip=True)
+                     for cell in tr.find_all(['td', 'th'])]
+                    for tr in table.find_all('tr')]
+            df = pd.DataFrame(rows[1:], columns=rows[0])
 
             # Save the DataFrame to a CSV file
             df.to_csv(filename, index=False)
@@ -54,30 +75,64 @@ class WebTableCopier:
         except Exception as e:
             print(f"Error saving table as CSV: {e}")
 
-    def download_webpage(self, url, output_file):
+    def fetch_html(self, url):
         """
-        Download the HTML content of a webpage and save it to a file.
+        Download the HTML content of a webpage into memory.
+
+        Unlike download_webpage, nothing is written to disk, so the
+        common scrape-and-parse path skips a full write of the response
+        body per URL.
 
         Args:
             url (str): The URL of the webpage to download.
-            output_file (str): The file path where the webpage content will be saved.
 
         Returns:
             str: The HTML content of the webpage as a string, or None if the download fails.
         """
         try:
-            # Send a GET request to the URL
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
+                # Read the declared encoding before iter_content consumes
+                # the stream; apparent_encoding is unavailable afterwards
+                encoding = response.encoding or 'utf-8'
+                chunks = list(response.iter_content(chunk_size=64 * 1024))
+            return b"".join(chunks).decode(encoding, errors='replace')
+        except requests.RequestException as e:
+            print(f"Error downloading the webpage: {e}")
+            return None
 
-            # Create the directory if it doesn't exist
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    def download_webpage(self, url, output_file):
+        """
+        Download the HTML content of a webpage and save it to a file.
 
-            # Save the content to the output file
-            with open(output_file, "wb") as f:
-                f.write(response.content)
+        Args:
+            url (str): The URL of the webpage to download.
+            output_file (str): The file path where the webpage content will be saved.
 
-            return response.text  # Return the HTML content
+        Returns:
+            str: The HTML content of the webpage as a string, or None if the download fails.
+        """
+        try:
+            # Stream the response in 64 KiB chunks, teeing each chunk to
+            # disk as it arrives instead of materializing the full body
+            # with response.content and then writing a second copy
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
+
+                # Create the directory if it doesn't exist
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+                # Read the declared encoding before iter_content consumes
+                # the stream; apparent_encoding is unavailable afterwards
+                encoding = response.encoding or 'utf-8'
+                chunks = []
+                with open(output_file, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
+                        chunks.append(chunk)
+
+            # Return the HTML content for parsing
+            return b"".join(chunks).decode(encoding, errors='replace')
         except requests.RequestException as e:
             print(f"Error downloading the webpage: {e}")
             return None
@@ -85,23 +140,27 @@ class WebTableCopier:
             print(f"Error saving the webpage content: {e}")
             return None
 
-    def save_tables_from_url(self, url, output_dir):
+    def save_tables_from_url(self, url, output_dir, save_html=False):
         """
         Download webpage, parse tables, and save them as CSV files.
 
         Args:
             url (str): The URL of the webpage.
             output_dir (str): The directory to save the CSV files.
+            save_html (bool, optional): Whether to also keep a copy of the
+                raw HTML as webpage.html, for debugging. Defaults to False.
         """
-        webpage_content = self.download_webpage(url, os.path.join(output_dir, "webpage.html"))
+        if save_html:
+            webpage_content = self.download_webpage(url, os.path.join(output_dir, "webpage.html"))
+        else:
+            webpage_content = self.fetch_html(url)
         if webpage_content is not None:  # Check if webpage content is not None
-            soup = BeautifulSoup(webpage_content, 'html.parser')
+            soup = BeautifulSoup(webpage_content, _BS4_PARSER)
             tables = soup.find_all('table')
             print(f"Found {len(tables)} tables on the webpage.")
 
             # Create the output directory if it doesn't exist
-            if len(tables) > 1:
-                os.makedirs(output_dir, exist_ok=True)
+            os.makedirs(output_dir, exist_ok=True)
 
             # Save each table as a separate CSV file
             for i, table in enumerate(tables, start=1):
@@ -113,7 +172,23 @@ class WebTableCopier:
         else:
             print("Failed to download the webpage.")
 
-    
+    def save_tables_from_urls(self, urls, output_dirs):
+        """
+        Save tables from several webpages concurrently.
+
+        The downloads are network-bound and threads release the GIL
+        around socket reads, so the pages are fetched in parallel over
+        the pooled session instead of one after another.
+
+        Args:
+            urls (list): The URLs of the webpages.
+            output_dirs (list): One output directory per URL for its CSV files.
+        """
+        with ThreadPoolExecutor(max_workers=min(16, len(urls) or 1)) as executor:
+            # Consume the iterator so worker exceptions propagate
+            list(executor.map(self.save_tables_from_url, urls, output_dirs))
+
+
 # Example usage:
 if __name__ == "__main__":
     WEBSITE_URL = "https://www.topstockresearch.com/rt/Screener/Technical/PivotPoint/StandardPivotPoint/ListSupportOrResistance"